@@ -1,27 +1,34 @@
-# Shared (always available)
-from .menu import Menu
-from .light_router import LightRouter, LightFactory
-from .config import content_blocks_dict, MODEL_CONFIG
-from .defaults import DEFAULT_MENU
-from .tools import (
-    build_langchain_tools,
-    current_time,
-    fetch_url,
-    read_file,
-    web_search,
-)
-# RAG: chunk_documents is stdlib-only; VectorStore lazy-imports qdrant-client
-# inside __init__, so the class is always importable but raises a clear
-# ImportError on instantiation if the [rag] extra is not installed.
-from .rag import chunk_documents, VectorStore
+# Public exports are resolved lazily (PEP 562) so `import free_lunch` stays
+# cheap: each submodule — and the provider SDKs / ddgs / httpx it pulls in —
+# is only imported the first time one of its names is accessed.
+from importlib import import_module
 
-# LangChain (optional)
-try:
-    from .router import LangChainRouter
-    from .llm_factory import LangChainFactory
-except ImportError:
-    LangChainRouter = None
-    LangChainFactory = None
+# name -> submodule that defines it
+_LAZY = {
+    # Shared (always available)
+    "Menu": ".menu",
+    "LightRouter": ".light_router",
+    "LightFactory": ".light_router",
+    "content_blocks_dict": ".config",
+    "MODEL_CONFIG": ".config",
+    "DEFAULT_MENU": ".defaults",
+    "build_langchain_tools": ".tools",
+    "current_time": ".tools",
+    "fetch_url": ".tools",
+    "read_file": ".tools",
+    "web_search": ".tools",
+    # RAG: chunk_documents is stdlib-only; VectorStore lazy-imports qdrant-client
+    # inside __init__, so the class is always importable but raises a clear
+    # ImportError on instantiation if the [rag] extra is not installed.
+    "chunk_documents": ".rag",
+    "VectorStore": ".rag",
+    # LangChain (optional) — resolve to None if langchain is not installed
+    "LangChainRouter": ".router",
+    "LangChainFactory": ".llm_factory",
+}
+# Optional names only resolve if .router (which imports langchain at top level)
+# does — .llm_factory defers its langchain imports, so it would import anyway
+_OPTIONAL = {"LangChainRouter", "LangChainFactory"}
 
 __all__ = [
     "Menu",
@@ -40,3 +47,22 @@ __all__ = [
     "chunk_documents",
     "VectorStore",
 ]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        if name in _OPTIONAL:
+            import_module(".router", __name__)
+        obj = getattr(import_module(_LAZY[name], __name__), name)
+    except ImportError:
+        if name not in _OPTIONAL:
+            raise
+        obj = None
+    globals()[name] = obj  # cache so later lookups skip __getattr__
+    return obj
+
+
+def __dir__():
+    return __all__
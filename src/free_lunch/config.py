@@ -1,12 +1,11 @@
 """
 Shared configuration and utilities — no LangChain dependency.
 """
+import os
 import re
-import logging
+from functools import lru_cache
 from typing import Any
 
-logger = logging.getLogger(__name__)
-
 _REASONING_TAGS = ("think", "thought")
 _REASONING_BLOCK_TYPES = ("thinking", "reasoning")
 
@@ -62,6 +61,7 @@ MODEL_CONFIG = {
 }
 
 
+@lru_cache(maxsize=256)
 def parse_model_id(model_id: str) -> tuple[str, str]:
     """
     Split and validate a 'provider::model' id against MODEL_CONFIG.
@@ -69,20 +69,55 @@ def parse_model_id(model_id: str) -> tuple[str, str]:
     The single source of truth for the model-id format, shared by both the
     LangChain and light factories. Each factory layers its own extra checks
     (LangChain verifies the API key is set; light reads it lazily at call time).
+    Cached: ids come from a small, fixed YAML set and are re-parsed on every call.
     """
-    if "::" not in model_id:
+    provider, sep, model = model_id.strip().partition("::")
+    if not sep:
         raise ValueError(f"Invalid ID '{model_id}'. Must be 'provider::model'")
-    provider, model = model_id.strip().split("::", 1)
     if provider not in MODEL_CONFIG:
         raise ValueError(f"Unknown provider '{provider}'. Supported: {list(MODEL_CONFIG)}")
     return provider, model
 
 
+# Cached env lookups (API keys are read on every factory call). Only present
+# values are cached, so a key set in os.environ after a miss is still seen.
+_ENV_CACHE: dict[str, str] = {}
+
+
+def _env_get(key: str) -> str | None:
+    """Cached ``os.environ.get(key)``; misses always re-check the environment."""
+    value = _ENV_CACHE.get(key)
+    if value is None:
+        value = os.environ.get(key)
+        if value is not None:
+            _ENV_CACHE[key] = value
+    return value
+
+
+def _env_present(key: str) -> bool:
+    """Cached ``key in os.environ``."""
+    return _env_get(key) is not None
+
+
+def _clear_env_cache() -> None:
+    """
+    Drop cached env lookups. Call after the environment changes
+    (e.g. ``load_dotenv(override=True)``) so changed keys are picked up.
+    """
+    _ENV_CACHE.clear()
+
+
 def flatten_content_blocks(content: Any) -> tuple[str, str | None]:
     """Split block-based message content into visible text and reasoning."""
     if isinstance(content, str):
         return content, None
 
+    # Fast path: most responses are a single {"type": "text", "text": ...} block
+    if isinstance(content, list) and len(content) == 1:
+        block = content[0]
+        if isinstance(block, dict) and block.get("type") == "text":
+            return str(block.get("text") or "").strip(), None
+
     text_parts = []
     reasoning_parts = []
 
@@ -2,11 +2,34 @@
 LangChain model factory — requires langchain packages.
 """
 from typing import Any
-import os
-from os import getenv
 from functools import lru_cache
+from types import MappingProxyType
 
-from .config import MODEL_CONFIG, parse_model_id
+import httpx
+
+from .config import MODEL_CONFIG, parse_model_id, _env_get, _env_present
+
+# Resolved once at import so create() merges params in a single expression.
+# provider -> read-only default constructor params
+_PROVIDER_TEMPLATES = {
+    p: MappingProxyType(cfg.get("extra_params", {})) for p, cfg in MODEL_CONFIG.items()
+}
+# provider -> env var holding its API key (None if it needs none)
+_KEY_ENV = {p: cfg["api_key"] for p, cfg in MODEL_CONFIG.items()}
+# provider -> whether to pass that key as `api_key` (False if the class reads the env itself)
+_INJECT_KEY = {p: cfg["include_api_key"] for p, cfg in MODEL_CONFIG.items()}
+
+# One pooled httpx client per provider, shared by every model built here so
+# they reuse keep-alive connections instead of each doing its own TCP/TLS setup.
+_HTTPX_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0)
+# google-genai builds its own httpx client and takes no client instance
+_NO_SHARED_HTTP = {"google"}
+
+
+@lru_cache(maxsize=None)
+def _shared_httpx(provider: str) -> httpx.Client:
+    # Request timeouts are set per call by the SDK from the model's `timeout`
+    return httpx.Client(limits=_HTTPX_LIMITS, follow_redirects=True)
 
 
 class LangChainFactory:
@@ -44,29 +67,74 @@ class LangChainFactory:
 
     @staticmethod
     def create(model_id: str, **kwargs: Any):
-        # 1. Parse ID
+        """
+        Build a chat model. Identical ``(model_id, kwargs, api_key)`` calls share
+        one process-wide instance, so every router reuses its connection pool.
+        Unhashable kwargs skip the cache and always build a fresh instance.
+        """
         provider, model_name = LangChainFactory._validate_and_parse(model_id)
-        config = MODEL_CONFIG[provider]
-        
-        # 2. Get Class (Cached & Lazy)
+        return LangChainFactory._create(provider, model_name, kwargs)
+
+    @staticmethod
+    def create_parsed(provider: str, model_name: str, **kwargs: Any):
+        """
+        ``create`` for an id that is already split (e.g. by ``Menu``, which stores
+        ``provider``/``model_name`` on each model). Skips re-parsing; still checks the key.
+        """
+        LangChainFactory._check_api_key(provider)
+        return LangChainFactory._create(provider, model_name, kwargs)
+
+    @staticmethod
+    def _create(provider: str, model_name: str, kwargs: dict):
+        # 1. Resolve API key. Read it even for providers whose class reads the env
+        # itself (Groq): it is part of the cache key, so a reloaded key means a new client.
+        key_env = _KEY_ENV[provider]
+        api_key = _env_get(key_env) if key_env else None
+
+        # 2. Reuse a cached instance when kwargs are hashable
+        try:
+            frozen_params = tuple(sorted(kwargs.items()))
+            hash(frozen_params)
+        except TypeError:
+            return LangChainFactory._build(provider, model_name, api_key, kwargs)
+        return LangChainFactory._cached_create(provider, model_name, api_key, frozen_params)
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _cached_create(provider: str, model_name: str, api_key, frozen_params: tuple):
+        """
+        Memoized ``_build``. ``api_key`` (the provider's env value, injected or not)
+        is part of the key, so a key changed by ``load_dotenv(override=True)``
+        builds a new client instead of a stale one.
+        """
+        return LangChainFactory._build(provider, model_name, api_key, dict(frozen_params))
+
+    @staticmethod
+    def _build(provider: str, model_name: str, api_key, kwargs: dict):
+        # Get Class (Cached & Lazy)
         model_class = LangChainFactory._get_model_class(provider)
-        
-        # 3. Merge Params
-        extra_params = config.get("extra_params", {}).copy()
-        extra_params.update(kwargs)
-        if config["include_api_key"]:
-            extra_params["api_key"] = getenv(config["api_key"])
 
-        # 4. Instantiate
-        return model_class(model=model_name, **extra_params)
+        # Merge Params
+        params = {**_PROVIDER_TEMPLATES[provider], **kwargs}
+        if _INJECT_KEY[provider]:
+            params["api_key"] = api_key
+        if provider not in _NO_SHARED_HTTP:
+            params.setdefault("http_client", _shared_httpx(provider))
+
+        # Instantiate
+        return model_class(model=model_name, **params)
 
     @staticmethod
     def _validate_and_parse(model_id: str):
         """Parse the shared 'provider::model' format, then verify the API key."""
         provider, model = parse_model_id(model_id)
+        LangChainFactory._check_api_key(provider)
+        return provider, model
 
-        required_key = MODEL_CONFIG[provider]["api_key"]
-        if required_key and required_key not in os.environ:
+    @staticmethod
+    def _check_api_key(provider: str):
+        if provider not in MODEL_CONFIG:
+            raise ValueError(f"Unknown provider '{provider}'. Supported: {list(MODEL_CONFIG)}")
+        required_key = _KEY_ENV[provider]
+        if required_key and not _env_present(required_key):
             raise ValueError(f"Missing API Key. Please set {required_key} in environment.")
-
-        return provider, model
@@ -1,10 +1,8 @@
 import os
-import yaml
+import sys
 import copy
 from functools import partial
 from typing import Any, Dict, Literal, Optional, Sequence, Union
-from dotenv import load_dotenv
-from os import getenv
 import warnings
 
 # package import
@@ -13,6 +11,7 @@ try:
 except ImportError:
     LangChainRouter = None
 from .light_router import LightRouter
+from .config import _clear_env_cache, _env_get
 from .defaults import DEFAULT_MENU
 
 # Map Environment Variable names to provider prefix in yaml
@@ -31,16 +30,19 @@ def _load_api_keys(env_path: str = None) -> set:
     """
     Loads .env and returns a set of available provider names (e.g. {'groq', 'google'}).
     """
+    from dotenv import load_dotenv  # lazy: keeps `import free_lunch` light
+
     # 1. Load Environment
     if env_path:
         load_dotenv(dotenv_path=env_path, override=True)
     else:
         load_dotenv(override=True)
+    _clear_env_cache()  # .env may have added/overridden keys
 
     # 2. Check availability
     available_providers = set(_KEYLESS_PROVIDERS)
     for env_key, provider_name in PROVIDER_MAPPING.items():
-        if os.getenv(env_key):
+        if _env_get(env_key):
             available_providers.add(provider_name)
             
     return available_providers
@@ -65,8 +67,13 @@ class Menu:
         if yaml_path:
             if not os.path.exists(yaml_path):
                 raise FileNotFoundError(f"YAML file not found: {yaml_path}")
+            import yaml  # lazy: only custom menus need a YAML parser
+
+            # libyaml's C loader is ~10x faster; PyYAML wheels bundle it, but fall
+            # back to the pure-Python loader when it was built without libyaml.
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
             with open(yaml_path, 'r') as f:
-                self.yaml_content = yaml.safe_load(f) or {}
+                self.yaml_content = yaml.load(f, Loader=loader) or {}
         else:
             # Zero-config: use built-in defaults
             self.yaml_content = copy.deepcopy(DEFAULT_MENU)
@@ -81,12 +88,11 @@ class Menu:
         1. Checks that YAML keys do not shadow class methods.
         2. Checks yaml keys are valid
         """
-        reserved_names = set(object.__dir__(self)) # get attr without yaml keys
         valid_types = {"langchain", "light"}
         
         for key, config in self.yaml_content.items():
             # Check 1: Reserved Keywords
-            if key in reserved_names:
+            if key in _RESERVED_NAMES:
                 source = self.yaml_path or "built-in defaults"
                 raise ValueError(
                     f"YAML Conflict: Key '{key}' reserves an internal function name. "
@@ -102,24 +108,25 @@ class Menu:
                 )
             
             original_models = config.get("models", [])
-            valid_models = []
-            invalid_ids = []
-            removed_cnt = 0
-            for m in original_models:
-                model_id = m.get("id", "")
-                
-                # Check 3: all ids must include one `::`
-                if "::" not in model_id:
-                    invalid_ids.append(model_id)
-                    continue  # Skip further checks for broken ID
-
-                # Check 4: API key Availability
-                provider = model_id.split("::")[0]
-                if provider in self.available_providers:
-                    valid_models.append(m)
-                else:
-                    removed_cnt += 1
-            
+            ids = [m.get("id", "") for m in original_models]
+
+            # Check 3: all ids must include one `::`
+            invalid_ids = [i for i in ids if "::" not in i]
+
+            # Check 4: API key Availability (one set difference instead of a per-model lookup)
+            missing = {i.partition("::")[0] for i in ids if "::" in i} - self.available_providers
+            valid_models = [
+                m for m, i in zip(original_models, ids)
+                if "::" in i and i.partition("::")[0] not in missing
+            ]
+            removed_cnt = len(ids) - len(invalid_ids) - len(valid_models)
+
+            # Pre-parse ids once so routers don't re-split them per call
+            for m in valid_models:
+                provider, _, model_name = m["id"].strip().partition("::")
+                m["provider"] = sys.intern(provider)
+                m["model_name"] = sys.intern(model_name)
+
             # update valid model list:
             config["models"] = valid_models
 
@@ -137,6 +144,11 @@ class Menu:
                     stacklevel=2
                     )
 
+        # Precompute the dispatcher so menu.<key> is a dict lookup: key -> (type, partial)
+        self._dispatch = {
+            key: (config.get("type"), self._build_dispatch(key))
+            for key, config in self.yaml_content.items()
+        }
 
     def _create_langchain_router(
         self,
@@ -145,6 +157,7 @@ class Menu:
         global_timeout: int = None,
         tools: Optional[Sequence[Any]] = None,
         tool_choice: Optional[Union[dict, str]] = None,
+        hedge: int = None,
     ):
         """Builder for heavy LangChain routers"""
         if LangChainRouter is None:
@@ -157,7 +170,8 @@ class Menu:
             func_name=func_name,
             models=config.get("models", []),
             timeout=timeout or config.get("timeout", 30),
-            global_timeout=global_timeout or config.get("global_timeout", 180)
+            global_timeout=global_timeout or config.get("global_timeout", 180),
+            hedge=hedge or config.get("hedge", 1),
         )
         return router.bind_tools(tools, tool_choice=tool_choice) if tools else router
 
@@ -171,30 +185,41 @@ class Menu:
             global_timeout=global_timeout or config.get("global_timeout", 180)
         )
 
+    def _build_dispatch(self, name: str) -> partial:
+        """Return the router-builder partial for YAML key ``name`` based on its type."""
+        router_type = self.yaml_content[name].get("type")
+
+        # 1. Model router based on 'type'
+        if router_type == "langchain":
+            return partial(self._create_langchain_router, func_name=name)
+        elif router_type == "light":
+            return partial(self._create_light_router, func_name=name)
+
+        # fallback
+        raise ValueError(f"Unknown router type '{router_type}' for '{name}'")
+
     def __getattr__(self, name: str):
         """
         Dynamic Dispatcher:
-        1. Checks if name exists in YAML file key
-        3. Returns the correct partial function based on model type
+        1. Looks up the precompiled partial for the YAML key
+        2. Keys added (or retyped) in yaml_content after init are resolved once, then cached
         """
-        if name not in self.yaml_content:
+        if name == "_dispatch":  # not set yet (e.g. during __init__ or copy)
+            raise AttributeError(name)
+        config = self.yaml_content.get(name)
+        if config is None:
             available = ", ".join(self.yaml_content.keys())
             raise AttributeError(
                 f"Menu item '{name}' not found. Available: {available}"
             )
 
-        # Retrieve configuration
-        config = self.yaml_content[name]
+        # yaml_content may have been edited or replaced since the entry was built
         router_type = config.get("type")
+        entry = self._dispatch.get(name)
+        if entry is None or entry[0] != router_type:
+            entry = self._dispatch[name] = (router_type, self._build_dispatch(name))
+        return entry[1]
 
-        # 1. Model router based on 'type'
-        if router_type == "langchain":
-            return partial(self._create_langchain_router, func_name=name)
-        elif router_type == "light":
-            return partial(self._create_light_router, func_name=name)
-
-        # fallback
-        raise ValueError(f"Unknown router type '{router_type}' for '{name}'")
     def __dir__(self):
         """
         Add dynamic YAML keys into method dir, helps IDE autocomplete
@@ -206,3 +231,10 @@ class Menu:
         dynamic_attrs = set(self.yaml_content.keys())
         
         return list(base_attrs | dynamic_attrs)
+
+
+# Names a YAML key must not shadow: everything defined on the class plus the
+# attributes set in __init__. Computed once at import instead of per Menu.
+_RESERVED_NAMES = frozenset(dir(Menu)) | {
+    "available_providers", "yaml_path", "yaml_content", "_dispatch",
+}
@@ -1,12 +1,19 @@
+import json
 import time
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional, Sequence, Union
+from collections import deque
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from itertools import islice
+from typing import Any
 
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import BaseMessage
 from langchain_core.outputs import ChatResult, ChatGeneration
-from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
 from langchain_core.runnables import Runnable
+from langchain_core.utils.function_calling import convert_to_openai_tool
 from pydantic import PrivateAttr, Field
 
 
@@ -17,6 +24,49 @@ logger = logging.getLogger(__name__)
 # HTTP status codes that indicate permanent (non-retryable) failures
 _PERMANENT_STATUS_CODES = {400, 401, 403, 404, 422}
 
+class _ToolSchemas(tuple):
+    """
+    Tools formatted by ``LangChainRouter.bind_tools()``, carrying the content key
+    (canonical JSON of schemas + tool_choice) for the bound-client cache, so it
+    is computed once per bind instead of once per call.
+    """
+    key: str
+
+
+def _format_tool(tool: Any) -> Any:
+    """OpenAI tool schema for ``tool``; dicts and unconvertible tools are returned as-is."""
+    if isinstance(tool, dict):
+        return tool
+    try:
+        return convert_to_openai_tool(tool)
+    except Exception:
+        # leave it for the provider's own bind_tools() to interpret
+        return tool
+
+
+class _RouterState:
+    """
+    Mutable per-router caches, kept outside pydantic so the hot path does plain
+    slot reads/writes instead of going through BaseModel's private-attr hooks.
+    """
+    __slots__ = ("models", "client_slots", "bound_cache")
+
+    def __init__(self, models: list[dict[str, Any]]):
+        # the `models` list these slots index into; model_copy() shallow-shares
+        # _state, so the router rebuilds it when its models list differs
+        self.models = models
+        n_models = len(models)
+        # cache BaseChatModel to reuse TCP/SSL connections (instances come from
+        # LangChainFactory's process-wide cache, so routers share them)
+        # one slot per entry in `models`, filled on first use by _get_client()
+        self.client_slots: list[BaseChatModel | None] = [None] * n_models
+
+        # cache tool-bound clients so bind_tools() (schema conversion) runs once per tool set
+        # key:val = (model_idx, _ToolSchemas.key): Runnable -- keyed by content, so callers
+        # that re-bind an equal tool list every turn still hit (and it can't grow per call)
+        self.bound_cache: dict[tuple[int, str], Runnable] = {}
+
+
 class LangChainRouter(BaseChatModel):
     """
     A unified router that behaves exactly like a standard LangChain ChatModel.
@@ -25,128 +75,300 @@ class LangChainRouter(BaseChatModel):
     
     # --- Configuration ---
     func_name: str
-    models: List[Dict[str, Any]]
+    models: list[dict[str, Any]]
     
     # Per-model timeout: max seconds to wait for a single API call (default 30s)
     timeout: int = Field(default=30, description="Per-model request timeout in seconds")
     
     # Global timeout: total seconds before giving up on the entire fallback loop (default 180s)
     global_timeout: int = Field(default=180, description="Total timeout budget for all retries")
+
+    # Hedged failover: race the top-N models in rotation and keep the first success (default 1 = sequential).
+    # Losing calls still run to completion, so only enable it for side-effect-free requests.
+    # Sync losers are left running in worker threads (shutdown(wait=False)); interpreter exit
+    # still joins them, so a script may hang up to the per-model `timeout` before exiting.
+    hedge: int = Field(default=1, ge=1, description="Number of models to call concurrently per attempt")
     
-    # Sticky session index (private)
-    _current_idx: int = PrivateAttr(default=0)
-    
-    # cache BaseChatModel to reuse TCP/SSL connections
-    # key:val =  'provider::model': BaseChatModel
-    _client_cache: Dict[str, BaseChatModel] = PrivateAttr(default_factory=dict)
+    # Client caches (private, see _RouterState)
+    _state: _RouterState = PrivateAttr()
+
+    def model_post_init(self, _context: Any, /) -> None:
+        super().model_post_init(_context)
+        self._state = _RouterState(self.models)
+
+    def _current_state(self) -> _RouterState:
+        """Return ``_state``, rebuilt if it indexes a different/resized ``models`` list."""
+        state = self._state
+        if state.models is not self.models or len(state.client_slots) != len(self.models):
+            state = self._state = _RouterState(self.models)
+        return state
 
     def bind_tools(
         self,
         tools: Sequence[Any],
         *,
-        tool_choice: Optional[Union[dict, str]] = None,
+        tool_choice: dict | str | None = None,
         **kwargs: Any,
     ) -> Runnable[Any, Any]:
         """
-        Stores tools/args in the config so they appear in _generate's kwargs later
+        Stores tools/args in the config so they appear in _generate's kwargs later.
+        Callables, BaseTools and pydantic classes are converted to OpenAI tool
+        schemas once here; dicts (schemas or provider-native tools such as
+        ``{"google_search": {}}``) are passed through untouched.
         """
-        return self.bind(tools=tools, tool_choice=tool_choice, **kwargs)
+        formatted_tools = _ToolSchemas(_format_tool(tool) for tool in tools)
+        formatted_tools.key = json.dumps([formatted_tools, tool_choice], sort_keys=True, default=str)
+        return self.bind(tools=formatted_tools, tool_choice=tool_choice, **kwargs)
 
     def _generate(
         self,
-        messages: List[BaseMessage],
-        stop: Optional[List[str]] = None,
-        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
         **kwargs: Any,
     ) -> ChatResult:
         """
         Intercepts the call, routes to underlying models, and handles failover.
         """
-        start_time = time.time()
+        _mono = time.monotonic
+        deadline = _mono() + self.global_timeout  # loop checks are one compare
         
         # A. Separate Tooling Args from Runtime Args
         tools = kwargs.pop("tools", None)
         tool_choice = kwargs.pop("tool_choice", None)
         
-        # Reset to preferred model (#0) at the start of each call
-        self._current_idx = 0
-        
+        # Rotation of model indices still in play; the preferred model (#0)
+        # is always at the front at the start of each call
+        active_models = deque(range(len(self.models)))
         consecutive_fails = 0
-        active_models = list(range(len(self.models)))  # indices of models still in rotation
         errors = []
         backoff = 1  # exponential backoff starting at 1s
+        hedge = self.hedge  # read field once
 
         while active_models:
             # Check Global Timeout
-            elapsed = time.time() - start_time
-            if elapsed > self.global_timeout:
+            remaining = deadline - _mono()
+            if remaining < 0:
+                break
+
+            # Pick Candidates (front of the rotation; one unless hedging)
+            batch = list(islice(active_models, hedge))
+            model_idx, response_msg, failures = self._invoke_batch(
+                batch, messages, stop, tools, tool_choice, kwargs, remaining
+            )
+            if model_idx is not None:
+                return self._to_result(response_msg, self.models[model_idx]["id"])
+
+            # failures are in batch order, i.e. front-of-rotation first
+            for model_idx, e in zip(batch, failures):
+                if self._handle_failure(e, self.models[model_idx]["id"], active_models, errors):
+                    consecutive_fails = 0
+                else:
+                    consecutive_fails += 1
+
+            # Full Cycle Backoff (exponential: 1s, 2s, 4s, capped at 10s)
+            if active_models and consecutive_fails >= len(active_models):
+                consecutive_fails = 0
+                if _mono() + backoff < deadline:
+                    logger.debug(f"Full cycle failed, backing off {backoff}s")
+                    time.sleep(backoff)
+                    backoff = min(backoff * 2, 10)
+
+        raise self._exhausted(errors)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """
+        Async twin of ``_generate``: same failover, but awaits ``ainvoke`` and
+        ``asyncio.sleep`` so backoff never blocks the event loop.
+        """
+        _mono = time.monotonic
+        deadline = _mono() + self.global_timeout
+
+        tools = kwargs.pop("tools", None)
+        tool_choice = kwargs.pop("tool_choice", None)
+
+        active_models = deque(range(len(self.models)))
+        consecutive_fails = 0
+        errors = []
+        backoff = 1
+        hedge = self.hedge
+
+        while active_models:
+            remaining = deadline - _mono()
+            if remaining < 0:
                 break
 
-            # Pick Candidate
-            idx_pos = self._current_idx % len(active_models)
-            model_idx = active_models[idx_pos]
+            batch = list(islice(active_models, hedge))
+            model_idx, response_msg, failures = await self._ainvoke_batch(
+                batch, messages, stop, tools, tool_choice, kwargs, remaining
+            )
+            if model_idx is not None:
+                return self._to_result(response_msg, self.models[model_idx]["id"])
+
+            for model_idx, e in zip(batch, failures):
+                if self._handle_failure(e, self.models[model_idx]["id"], active_models, errors):
+                    consecutive_fails = 0
+                else:
+                    consecutive_fails += 1
+
+            if active_models and consecutive_fails >= len(active_models):
+                consecutive_fails = 0
+                if _mono() + backoff < deadline:
+                    logger.debug(f"Full cycle failed, backing off {backoff}s")
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, 10)
+
+        raise self._exhausted(errors)
+
+    def _invoke_batch(self, batch, messages, stop, tools, tool_choice, kwargs, timeout):
+        """
+        Call the models in ``batch`` (indices into ``self.models``). A single model
+        is called inline; several are raced in threads and the first success wins.
+
+        Returns ``(model_idx, response, None)`` on success, else
+        ``(None, None, failures)`` with one exception per batch entry, in order.
+        """
+        if len(batch) == 1:
+            try:
+                llm = self._get_invokable(batch[0], tools, tool_choice)
+                return batch[0], llm.invoke(messages, stop=stop, **kwargs), None
+            except Exception as e:
+                return None, None, [e]
+
+        def call(model_idx):
+            llm = self._get_invokable(model_idx, tools, tool_choice)
+            return llm.invoke(messages, stop=stop, **kwargs)
+
+        executor = ThreadPoolExecutor(max_workers=len(batch))
+        futures = {executor.submit(call, i): i for i in batch}
+        failures = {}
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                try:
+                    return futures[future], future.result(), None
+                except Exception as e:
+                    failures[futures[future]] = e
+        except FuturesTimeoutError:
+            pass
+        finally:
+            # First success wins: don't wait for the losers
+            executor.shutdown(wait=False, cancel_futures=True)
+        return None, None, [
+            failures.get(i) or TimeoutError("hedged call exceeded global timeout") for i in batch
+        ]
+
+    async def _ainvoke_batch(self, batch, messages, stop, tools, tool_choice, kwargs, timeout):
+        """Async twin of ``_invoke_batch``; losing calls are cancelled."""
+        if len(batch) == 1:
+            try:
+                llm = self._get_invokable(batch[0], tools, tool_choice)
+                return batch[0], await llm.ainvoke(messages, stop=stop, **kwargs), None
+            except Exception as e:
+                return None, None, [e]
+
+        async def call(model_idx):
+            llm = self._get_invokable(model_idx, tools, tool_choice)
+            return await llm.ainvoke(messages, stop=stop, **kwargs)
+
+        tasks = {asyncio.ensure_future(call(i)): i for i in batch}
+        failures = {}
+        deadline = time.monotonic() + timeout
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(0, deadline - time.monotonic()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    break  # global timeout
+                for task in done:
+                    if task.exception() is None:
+                        return tasks[task], task.result(), None
+                    failures[tasks[task]] = task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+        return None, None, [
+            failures.get(i) or TimeoutError("hedged call exceeded global timeout") for i in batch
+        ]
+
+    def _get_client(self, model_idx: int) -> BaseChatModel:
+        """Return the client for ``self.models[model_idx]``, creating it only once."""
+        client_slots = self._current_state().client_slots
+        client = client_slots[model_idx]
+        if client is None:
             candidate = self.models[model_idx]
-            model_id = candidate["id"]
-            
             # Per-model timeout: params.timeout > profile timeout > default 30s
             yaml_params = dict(candidate.get("params", {}))
             model_timeout = yaml_params.pop("timeout", self.timeout)
-            
-            try:
-                logger.debug(f"Trying {model_id} (timeout={model_timeout}s)")
-                
-                # Retrieve the cached instance | Create it only once
-                if model_id not in self._client_cache:
-                    self._client_cache[model_id] = LangChainFactory.create(
-                        model_id, timeout=model_timeout, **yaml_params
-                    )
-                base_llm = self._client_cache[model_id]
-
-                # applies tools just for this request.
-                if tools:
-                    invokable_llm = base_llm.bind_tools(tools, tool_choice=tool_choice)
-                else:
-                    invokable_llm = base_llm
+            provider, model_name = candidate.get("provider"), candidate.get("model_name")
+            # pre-parsed by Menu; trust the fields only while they still match `id`
+            if provider and model_name and f"{provider}::{model_name}" == candidate["id"].strip():
+                client = LangChainFactory.create_parsed(
+                    provider, model_name, timeout=model_timeout, **yaml_params
+                )
+            else:
+                client = LangChainFactory.create(
+                    candidate["id"], timeout=model_timeout, **yaml_params
+                )
+            client_slots[model_idx] = client
+        return client
 
-                # pass the remaining kwargs
-                response_msg = invokable_llm.invoke(messages, stop=stop, **kwargs)
+    def _get_invokable(self, model_idx: int, tools, tool_choice) -> Runnable:
+        """Return the cached client for model ``model_idx``, with tools bound if given."""
+        logger.debug(f"Trying {self.models[model_idx]['id']}")
+        base_llm = self._get_client(model_idx)
 
-                # E. Inject ID for debugging
-                response_msg.response_metadata["model_id"] = model_id
-                
-                return ChatResult(generations=[ChatGeneration(message=response_msg)])
+        if not tools:
+            return base_llm
 
-            except (KeyboardInterrupt, SystemExit):
-                raise
-            except Exception as e:
-                errors.append(f"{model_id}: {e}")
-                logger.warning(f"Failover from {model_id}: {e}")
-                
-                # Check if error is non-retryable for this request
-                if self._is_permanent_error(e) or self._is_rate_limit(e):
-                    reason = "permanent error" if self._is_permanent_error(e) else "rate limited"
-                    logger.warning(f"Removing {model_id} from rotation ({reason})")
-                    active_models.pop(idx_pos)
-                    consecutive_fails = 0
-                    if not active_models:
-                        break
-                    self._current_idx = idx_pos % len(active_models)
-                    continue
-                
-                # Rotate Index
-                self._current_idx = (idx_pos + 1) % len(active_models)
-                consecutive_fails += 1
-                
-                # Full Cycle Backoff (exponential: 1s, 2s, 4s, capped at 10s)
-                if consecutive_fails >= len(active_models):
-                    consecutive_fails = 0
-                    remaining = self.global_timeout - (time.time() - start_time)
-                    if backoff < remaining:
-                        logger.debug(f"Full cycle failed, backing off {backoff}s")
-                        time.sleep(backoff)
-                        backoff = min(backoff * 2, 10)
+        tools_key = getattr(tools, "key", None)
+        if tools_key is None:
+            # ad-hoc invoke(tools=...) rather than bind_tools(): bind without caching
+            return base_llm.bind_tools(tools, tool_choice=tool_choice)
+
+        # Reuse the tool-bound client for an identical tool set
+        key = (model_idx, tools_key)
+        bound_cache = self._current_state().bound_cache
+        bound = bound_cache.get(key)
+        if bound is None:
+            bound = bound_cache[key] = base_llm.bind_tools(tools, tool_choice=tool_choice)
+        return bound
+
+    @staticmethod
+    def _to_result(response_msg: BaseMessage, model_id: str) -> ChatResult:
+        # Inject ID for debugging
+        response_msg.response_metadata["model_id"] = model_id
+        return ChatResult(generations=[ChatGeneration(message=response_msg)])
+
+    def _handle_failure(self, e: Exception, model_id: str, active_models: deque, errors: list) -> bool:
+        """
+        Record a failed attempt and update the rotation in place: drop the model
+        at the front (returns True) or rotate it to the back (returns False).
+        """
+        errors.append(f"{model_id}: {e}")
+        logger.warning(f"Failover from {model_id}: {e}")
+
+        # Check if error is non-retryable for this request
+        if self._is_permanent_error(e) or self._is_rate_limit(e):
+            reason = "permanent error" if self._is_permanent_error(e) else "rate limited"
+            logger.warning(f"Removing {model_id} from rotation ({reason})")
+            active_models.popleft()
+            return True
+
+        # Rotate to the next model
+        active_models.rotate(-1)
+        return False
 
-        raise TimeoutError(
+    def _exhausted(self, errors: list) -> TimeoutError:
+        return TimeoutError(
             f"FreeLunch '{self.func_name}' exhausted all models. "
             f"Last errors: {errors[-3:]}"
         )
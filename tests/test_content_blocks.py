@@ -73,6 +73,23 @@ class ContentBlocksDictTest(unittest.TestCase):
         self.assertEqual(result["reasoning"], "private")
         self.assertEqual(result["raw_text"], "<think>private</think>Visible")
 
+    def test_accepts_single_text_block(self):
+        result = content_blocks_dict(FakeAIMessage([{"type": "text", "text": " Hello "}]))
+
+        self.assertEqual(result["text"], "Hello")
+        self.assertNotIn("reasoning", result)
+
+    def test_splits_reasoning_and_text_blocks(self):
+        content = [
+            {"type": "thinking", "thinking": "private"},
+            {"type": "text", "text": "Visible"},
+        ]
+
+        result = content_blocks_dict(FakeAIMessage(content))
+
+        self.assertEqual(result["text"], "Visible")
+        self.assertEqual(result["reasoning"], "private")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,139 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+sys.path.insert(0, SRC)
+
+from free_lunch.config import _clear_env_cache
+from free_lunch.llm_factory import LangChainFactory
+
+
+class LazyExportTest(unittest.TestCase):
+    def test_langchain_exports_are_none_without_langchain(self):
+        # A None entry in sys.modules makes `import langchain_core` raise ImportError
+        code = (
+            "import sys; sys.modules['langchain_core'] = None\n"
+            "import free_lunch\n"
+            "assert free_lunch.LangChainFactory is None, free_lunch.LangChainFactory\n"
+            "assert free_lunch.LangChainRouter is None, free_lunch.LangChainRouter\n"
+        )
+        env = {**os.environ, "PYTHONPATH": SRC}
+        result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+class EnvCacheTest(unittest.TestCase):
+    def setUp(self):
+        _clear_env_cache()
+        self.addCleanup(_clear_env_cache)
+
+    def test_missing_key_raises(self):
+        with patch.dict(os.environ, {}, clear=True):
+            with self.assertRaises(ValueError):
+                LangChainFactory._validate_and_parse("groq::llama-3.1-8b-instant")
+
+    def test_new_key_visible_after_cache_clear(self):
+        with patch.dict(os.environ, {}, clear=True):
+            with self.assertRaises(ValueError):
+                LangChainFactory._validate_and_parse("groq::llama-3.1-8b-instant")
+            os.environ["GROQ_API_KEY"] = "test-key"
+            _clear_env_cache()
+
+            result = LangChainFactory._validate_and_parse("groq::llama-3.1-8b-instant")
+
+        self.assertEqual(result, ("groq", "llama-3.1-8b-instant"))
+
+    def test_key_set_after_failure_is_seen(self):
+        with patch.dict(os.environ, {}, clear=True):
+            with self.assertRaises(ValueError):
+                LangChainFactory._validate_and_parse("openrouter::openai/gpt-oss-120b:free")
+            os.environ["OPENROUTER_API_KEY"] = "test-key"
+
+            result = LangChainFactory._validate_and_parse("openrouter::openai/gpt-oss-120b:free")
+
+        self.assertEqual(result, ("openrouter", "openai/gpt-oss-120b:free"))
+
+
+class FakeChatModel:
+    def __init__(self, model, **params):
+        self.model = model
+        self.params = params
+
+
+@patch.object(LangChainFactory, "_get_model_class", return_value=FakeChatModel)
+class CreateCacheTest(unittest.TestCase):
+    def setUp(self):
+        _clear_env_cache()
+        LangChainFactory._cached_create.cache_clear()
+        self.addCleanup(_clear_env_cache)
+        self.addCleanup(LangChainFactory._cached_create.cache_clear)
+
+    @patch.dict(os.environ, {"GOOGLE_API_KEY": "test-key"})
+    def test_merges_defaults_kwargs_and_api_key(self, _mock_class):
+        model = LangChainFactory.create("google::gemini-2.5-flash", timeout=30)
+
+        self.assertEqual(model.model, "gemini-2.5-flash")
+        self.assertEqual(model.params, {"max_retries": 0, "timeout": 30, "api_key": "test-key"})
+
+    @patch.dict(os.environ, {"GROQ_API_KEY": "test-key", "OPENROUTER_API_KEY": "test-key"})
+    def test_models_share_provider_http_client(self, _mock_class):
+        first = LangChainFactory.create("groq::llama-3.1-8b-instant")
+        second = LangChainFactory.create("groq::openai/gpt-oss-20b")
+        other = LangChainFactory.create("openrouter::openai/gpt-oss-120b:free")
+
+        self.assertIs(first.params["http_client"], second.params["http_client"])
+        self.assertIsNot(first.params["http_client"], other.params["http_client"])
+
+    @patch.dict(os.environ, {"GROQ_API_KEY": "test-key"})
+    def test_create_parsed_matches_create(self, _mock_class):
+        parsed = LangChainFactory.create_parsed("groq", "llama-3.1-8b-instant", timeout=30)
+        created = LangChainFactory.create("groq::llama-3.1-8b-instant", timeout=30)
+
+        self.assertIs(parsed, created)
+        with self.assertRaises(ValueError):
+            LangChainFactory.create_parsed("unknown", "model")
+
+    @patch.dict(os.environ, {"GROQ_API_KEY": "test-key"})
+    def test_identical_calls_share_instance(self, _mock_class):
+        first = LangChainFactory.create("groq::llama-3.1-8b-instant", timeout=30)
+        second = LangChainFactory.create("groq::llama-3.1-8b-instant", timeout=30)
+        other = LangChainFactory.create("groq::llama-3.1-8b-instant", timeout=60)
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+    @patch.dict(os.environ, {"GROQ_API_KEY": "test-key"})
+    def test_unhashable_kwargs_skip_cache(self, _mock_class):
+        first = LangChainFactory.create("groq::llama-3.1-8b-instant", stop=["\n"])
+        second = LangChainFactory.create("groq::llama-3.1-8b-instant", stop=["\n"])
+
+        self.assertIsNot(first, second)
+        self.assertEqual(first.params["stop"], ["\n"])
+
+    @patch.dict(os.environ, {"GOOGLE_API_KEY": "old-key"})
+    def test_changed_api_key_builds_new_instance(self, _mock_class):
+        first = LangChainFactory.create("google::gemini-2.5-flash")
+        os.environ["GOOGLE_API_KEY"] = "new-key"
+        _clear_env_cache()
+        second = LangChainFactory.create("google::gemini-2.5-flash")
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.params["api_key"], "new-key")
+
+    @patch.dict(os.environ, {"GROQ_API_KEY": "old-key"})
+    def test_changed_env_read_key_builds_new_instance(self, _mock_class):
+        # ChatGroq reads GROQ_API_KEY itself, so the key is never injected
+        first = LangChainFactory.create("groq::llama-3.1-8b-instant")
+        os.environ["GROQ_API_KEY"] = "new-key"
+        _clear_env_cache()
+        second = LangChainFactory.create("groq::llama-3.1-8b-instant")
+
+        self.assertIsNot(first, second)
+        self.assertNotIn("api_key", second.params)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from free_lunch import LightRouter, Menu
+
+
+class MenuValidationTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        # Empty .env so tests never pick up real keys from the working tree
+        self.env_path = Path(self.tmpdir.name) / ".env"
+        self.env_path.write_text("")
+
+    def write_yaml(self, text):
+        path = Path(self.tmpdir.name) / "menu.yaml"
+        path.write_text(text)
+        return str(path)
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_rejects_key_shadowing_menu_attribute(self):
+        for key in ("yaml_content", "_validate_yaml"):
+            path = self.write_yaml(f"{key}:\n  type: light\n  models:\n    - id: default::openai\n")
+            with self.assertRaises(ValueError):
+                Menu(path, env_path=str(self.env_path))
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_rejects_invalid_model_id(self):
+        path = self.write_yaml("fast:\n  type: light\n  models:\n    - id: no-separator\n")
+
+        with self.assertRaises(ValueError):
+            Menu(path, env_path=str(self.env_path))
+
+    @patch.dict(os.environ, {"GROQ_API_KEY": "test-key"}, clear=True)
+    def test_drops_models_without_api_key(self):
+        path = self.write_yaml(
+            "fast:\n  type: light\n  models:\n"
+            "    - id: groq::llama-3.1-8b-instant\n"
+            "    - id: google::gemini-2.5-flash\n"
+        )
+
+        with self.assertWarns(UserWarning):
+            menu = Menu(path, env_path=str(self.env_path))
+
+        (model,) = menu.yaml_content["fast"]["models"]
+        self.assertEqual(model["id"], "groq::llama-3.1-8b-instant")
+        self.assertEqual((model["provider"], model["model_name"]), ("groq", "llama-3.1-8b-instant"))
+
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_dispatch_reuses_handler_and_resolves_late_keys(self):
+        path = self.write_yaml("fast:\n  type: light\n  models:\n    - id: default::openai\n")
+        menu = Menu(path, env_path=str(self.env_path))
+
+        self.assertIs(menu.fast, menu.fast)
+        menu.yaml_content["late"] = {"type": "light", "models": [{"id": "default::openai"}]}
+        self.assertEqual(menu.late().func_name, "late")
+        with self.assertRaises(AttributeError):
+            menu.missing
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_dispatch_follows_replaced_yaml_content(self):
+        path = self.write_yaml("fast:\n  type: langchain\n  models:\n    - id: default::openai\n")
+        menu = Menu(path, env_path=str(self.env_path))
+
+        menu.yaml_content = {"fast": {"type": "light", "models": [{"id": "default::openai"}]}}
+        self.assertIsInstance(menu.fast(), LightRouter)
+        menu.yaml_content = {}
+        with self.assertRaises(AttributeError):
+            menu.fast
+
+
+if __name__ == "__main__":
+    unittest.main()
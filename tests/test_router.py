@@ -0,0 +1,287 @@
+import asyncio
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+try:
+    from langchain_core.messages import AIMessage
+    from free_lunch.router import LangChainRouter
+except ImportError:
+    AIMessage = None
+    LangChainRouter = None
+
+
+class FakeStatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class FakeChatModel:
+    """Replays ``outcomes`` in order: an exception to raise, or text to return."""
+
+    def __init__(self, model_id, outcomes, calls, delay=0):
+        self.model_id = model_id
+        self.outcomes = list(outcomes)
+        self.calls = calls
+        self.delay = delay
+
+    def _next(self):
+        self.calls.append(self.model_id)
+        if self.delay:
+            time.sleep(self.delay)
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return AIMessage(content=outcome)
+
+    def bind_tools(self, tools, tool_choice=None):
+        self.bind_count = getattr(self, "bind_count", 0) + 1
+        return self
+
+    def invoke(self, messages, stop=None, **kwargs):
+        return self._next()
+
+    async def ainvoke(self, messages, stop=None, **kwargs):
+        return self._next()
+
+
+@unittest.skipIf(LangChainRouter is None, "langchain extra is not installed")
+class LangChainRouterTest(unittest.TestCase):
+    def make_router(self, outcomes, delays=None, **kwargs):
+        """``outcomes`` maps model_id -> list of outcomes for FakeChatModel."""
+        self.calls = []
+        delays = delays or {}
+        fakes = {
+            mid: FakeChatModel(mid, out, self.calls, delay=delays.get(mid, 0))
+            for mid, out in outcomes.items()
+        }
+        patcher = patch(
+            "free_lunch.router.LangChainFactory.create",
+            side_effect=lambda model_id, **params: fakes[model_id],
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        models = [{"id": mid} for mid in outcomes]
+        return LangChainRouter(func_name="test", models=models, **kwargs)
+
+    def test_returns_first_success_with_model_id(self):
+        router = self.make_router({"groq::a": ["hello"], "groq::b": ["unused"]})
+
+        result = router.invoke("hi")
+
+        self.assertEqual(result.content, "hello")
+        self.assertEqual(result.response_metadata["model_id"], "groq::a")
+        self.assertEqual(self.calls, ["groq::a"])
+
+    def test_rate_limited_model_is_dropped(self):
+        router = self.make_router({
+            "groq::a": [FakeStatusError(429)],
+            "groq::b": [RuntimeError("flaky"), "ok"],
+        })
+
+        with patch("free_lunch.router.time.sleep"):
+            result = router.invoke("hi")
+
+        self.assertEqual(result.response_metadata["model_id"], "groq::b")
+        self.assertEqual(self.calls, ["groq::a", "groq::b", "groq::b"])
+
+    def test_transient_error_rotates_to_next_model(self):
+        router = self.make_router({
+            "groq::a": [RuntimeError("flaky"), "back"],
+            "groq::b": [RuntimeError("flaky")],
+        })
+
+        with patch("free_lunch.router.time.sleep") as mock_sleep:
+            result = router.invoke("hi")
+
+        self.assertEqual(result.content, "back")
+        self.assertEqual(self.calls, ["groq::a", "groq::b", "groq::a"])
+        mock_sleep.assert_called_once_with(1)
+
+    def test_raises_when_all_models_fail(self):
+        router = self.make_router({
+            "groq::a": [FakeStatusError(401)],
+            "groq::b": [FakeStatusError(404)],
+        })
+
+        with self.assertRaises(TimeoutError):
+            router.invoke("hi")
+
+    def test_bound_tools_are_reused_across_calls(self):
+        router = self.make_router({"groq::a": ["hello"]})
+        bound = router.bind_tools([{"type": "function", "function": {"name": "noop"}}])
+
+        bound.invoke("hi")
+        bound.invoke("again")
+
+        self.assertEqual(router._state.client_slots[0].bind_count, 1)
+
+    def test_bind_tools_twice_binds_base_model_once(self):
+        def add(a: int, b: int) -> int:
+            """Add two integers."""
+            return a + b
+
+        router = self.make_router({"groq::a": ["hello"]})
+        tools = [add]
+
+        router.bind_tools(tools).invoke("hi")
+        router.bind_tools(tools).invoke("again")
+
+        self.assertEqual(router._state.client_slots[0].bind_count, 1)
+
+    def test_rebinding_equal_tools_hits_cache(self):
+        router = self.make_router({"groq::a": ["hello"]})
+
+        for _ in range(5):
+            # a fresh but equal list every turn, like an agent loop re-binding
+            router.bind_tools([{"type": "function", "function": {"name": "noop"}}]).invoke("hi")
+
+        self.assertEqual(router._state.client_slots[0].bind_count, 1)
+        self.assertEqual(len(router._state.bound_cache), 1)
+
+    def test_adhoc_invoke_tools_are_not_cached(self):
+        router = self.make_router({"groq::a": ["hello"]})
+
+        router.invoke("hi", tools=[{"type": "function", "function": {"name": "noop"}}])
+        router.invoke("hi", tools=[{"type": "function", "function": {"name": "other"}}])
+
+        self.assertEqual(router._state.client_slots[0].bind_count, 2)
+        self.assertEqual(router._state.bound_cache, {})
+
+    def test_rebinding_bound_runnable_with_new_tools_skips_stale_key(self):
+        router = self.make_router({"groq::a": ["hello"]})
+        bound = router.bind_tools([{"type": "function", "function": {"name": "noop"}}])
+
+        bound.invoke("hi")
+        bound.bind(tools=[{"type": "function", "function": {"name": "other"}}]).invoke("hi")
+
+        self.assertEqual(router._state.client_slots[0].bind_count, 2)
+        self.assertEqual(len(router._state.bound_cache), 1)
+
+    def test_bind_tools_precomputes_openai_schemas(self):
+        def add(a: int, b: int) -> int:
+            """Add two integers."""
+            return a + b
+
+        router = self.make_router({"groq::a": ["hello"]})
+        bound = router.bind_tools([add])
+
+        (schema,) = bound.kwargs["tools"]
+        self.assertEqual(schema["type"], "function")
+        self.assertEqual(schema["function"]["name"], "add")
+
+    def test_bind_tools_passes_native_tool_dicts_through(self):
+        router = self.make_router({"groq::a": ["hello"]})
+        native = {"google_search": {}}
+
+        bound = router.bind_tools([native, {"type": "browser_search"}])
+
+        self.assertIs(bound.kwargs["tools"][0], native)
+        self.assertEqual(bound.kwargs["tools"][1], {"type": "browser_search"})
+        self.assertEqual(bound.invoke("hi").content, "hello")
+
+    def test_model_copy_with_new_models_uses_their_clients(self):
+        router = self.make_router({"groq::a": ["from a"], "groq::b": ["from b"]})
+        router.invoke("hi")  # fill the slot for groq::a
+
+        copied = router.model_copy(update={"models": [{"id": "groq::b"}]})
+        result = copied.invoke("hi")
+
+        self.assertEqual(result.content, "from b")
+        self.assertEqual(result.response_metadata["model_id"], "groq::b")
+        self.assertEqual(router.invoke("hi").content, "from a")
+
+    def test_preparsed_models_skip_id_parsing(self):
+        fake = FakeChatModel("groq::a", ["parsed"], [])
+        router = LangChainRouter(
+            func_name="test",
+            models=[{"id": "groq::a", "provider": "groq", "model_name": "a"}],
+        )
+
+        with patch("free_lunch.router.LangChainFactory.create_parsed", return_value=fake) as mock_parsed, \
+             patch("free_lunch.router.LangChainFactory.create") as mock_create:
+            result = router.invoke("hi")
+
+        self.assertEqual(result.content, "parsed")
+        mock_parsed.assert_called_once_with("groq", "a", timeout=30)
+        mock_create.assert_not_called()
+
+    def test_stale_or_partial_parsed_fields_fall_back_to_id(self):
+        fake = FakeChatModel("groq::b", ["from id"], [])
+        router = LangChainRouter(
+            func_name="test",
+            models=[
+                {"id": "groq::b", "provider": "groq", "model_name": "a"},  # id edited after Menu init
+                {"id": "groq::b", "provider": "groq"},
+            ],
+        )
+
+        with patch("free_lunch.router.LangChainFactory.create_parsed") as mock_parsed, \
+             patch("free_lunch.router.LangChainFactory.create", return_value=fake) as mock_create:
+            router._get_client(0)
+            router._get_client(1)
+
+        mock_parsed.assert_not_called()
+        self.assertEqual(mock_create.call_count, 2)
+        mock_create.assert_called_with("groq::b", timeout=30)
+
+    def test_ainvoke_fails_over_without_blocking_sleep(self):
+        router = self.make_router({
+            "groq::a": [RuntimeError("flaky")],
+            "groq::b": [RuntimeError("flaky"), "async ok"],
+        })
+
+        with patch("free_lunch.router.asyncio.sleep") as mock_sleep, \
+             patch("free_lunch.router.time.sleep") as mock_time_sleep:
+            result = asyncio.run(router.ainvoke("hi"))
+
+        self.assertEqual(result.content, "async ok")
+        self.assertEqual(result.response_metadata["model_id"], "groq::b")
+        mock_time_sleep.assert_not_called()
+
+
+    def test_hedge_returns_fastest_success(self):
+        router = self.make_router(
+            {"groq::slow": ["slow"], "groq::fast": ["fast"], "groq::unused": ["unused"]},
+            delays={"groq::slow": 0.5},
+            hedge=2,
+        )
+
+        result = router.invoke("hi")
+
+        self.assertEqual(result.response_metadata["model_id"], "groq::fast")
+        self.assertNotIn("groq::unused", self.calls)
+
+    def test_hedge_handles_failures_in_rotation_order(self):
+        router = self.make_router({
+            "groq::a": [FakeStatusError(429)],
+            "groq::b": [RuntimeError("flaky"), "b ok"],
+            "groq::c": [RuntimeError("flaky")],
+        }, hedge=2)
+
+        with patch("free_lunch.router.time.sleep"):
+            result = router.invoke("hi")
+
+        # a dropped and b rotated behind c, so the next race is (c, b)
+        self.assertEqual(result.response_metadata["model_id"], "groq::b")
+        self.assertEqual(sorted(self.calls[:2]), ["groq::a", "groq::b"])
+        self.assertEqual(sorted(self.calls[2:]), ["groq::b", "groq::c"])
+
+    def test_async_hedge_returns_first_success(self):
+        router = self.make_router(
+            {"groq::a": [RuntimeError("flaky")], "groq::b": ["async ok"]},
+            hedge=2,
+        )
+
+        result = asyncio.run(router.ainvoke("hi"))
+
+        self.assertEqual(result.response_metadata["model_id"], "groq::b")
+
+
+if __name__ == "__main__":
+    unittest.main()